@@ -2,6 +2,7 @@
 
 import os
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection, PatchCollection
 
 python_logo_colors = {
     "blue": "#4B8BBE",
@@ -20,64 +21,40 @@ plt.rcParams["savefig.dpi"] = 300
 def main():
     # Create a figure and axis
     fig, ax = plt.subplots(figsize=(3, 3))
+    sizes = [0.5, 0.25, 0.125, 0.0625]
 
-    # Draw square
-    square = plt.Rectangle(
-        (0, 0),
-        1,
-        1,
-        facecolor=python_logo_colors["light_gray"],
-        linewidth=LINEWIDTH,
-        edgecolor="k",
+    # Draw square, top right squares in blue, and alternating yellow squares
+    squares = [plt.Rectangle((0, 0), 1, 1)]
+    colors = [python_logo_colors["light_gray"]]
+    for x in sizes:
+        squares.append(plt.Rectangle((x, x), x, x))
+        colors.append(python_logo_colors["blue"])
+    for i, x in enumerate(sizes):
+        squares.append(plt.Rectangle((x, 0) if i % 2 == 0 else (0, x), x, x))
+        colors.append(python_logo_colors["yellow"])
+    ax.add_collection(
+        PatchCollection(
+            squares,
+            facecolors=colors,
+            edgecolors="k",
+            linewidths=LINEWIDTH,
+            joinstyle="miter",
+        )
     )
-    ax.add_patch(square)
 
     # Divide square lower left, and redot it 4 times
-    ax.plot([0.5, 0.5], [0, 1], color="k", linewidth=LINEWIDTH)
-    ax.plot([0, 1], [0.5, 0.5], color="k", linewidth=LINEWIDTH)
-    ax.plot([0.25, 0.25], [0, 0.5], color="k", linewidth=LINEWIDTH)
-    ax.plot([0, 0.5], [0.25, 0.25], color="k", linewidth=LINEWIDTH)
-    ax.plot([0.125, 0.125], [0, 0.25], color="k", linewidth=LINEWIDTH)
-    ax.plot([0, 0.25], [0.125, 0.125], color="k", linewidth=LINEWIDTH)
-    ax.plot([0.0625, 0.0625], [0, 0.125], color="k", linewidth=LINEWIDTH)
-    ax.plot([0, 0.125], [0.0625, 0.0625], color="k", linewidth=LINEWIDTH)
-
-    # Color top right squares in blue
-    for x in [0.5, 0.25, 0.125, 0.0625]:
-        ax.add_patch(
-            plt.Rectangle(
-                (x, x),
-                x,
-                x,
-                facecolor=python_logo_colors["blue"],
-                linewidth=LINEWIDTH,
-                edgecolor="k",
-            )
+    lines = []
+    for x in sizes:
+        lines.append([(x, 0), (x, 2 * x)])
+        lines.append([(0, x), (2 * x, x)])
+    ax.add_collection(
+        LineCollection(
+            lines,
+            colors="k",
+            linewidths=LINEWIDTH,
+            capstyle="projecting",
         )
-
-    for i, x in enumerate([0.5, 0.25, 0.125, 0.0625]):
-        if i % 2 == 0:
-            ax.add_patch(
-                plt.Rectangle(
-                    (x, 0),
-                    x,
-                    x,
-                    facecolor=python_logo_colors["yellow"],
-                    linewidth=LINEWIDTH,
-                    edgecolor="k",
-                )
-            )
-        else:
-            ax.add_patch(
-                plt.Rectangle(
-                    (0, x),
-                    x,
-                    x,
-                    facecolor=python_logo_colors["yellow"],
-                    linewidth=LINEWIDTH,
-                    edgecolor="k",
-                )
-            )
+    )
 
     # Remove axes
     ax.set_xlim(-0.1, 1.1)
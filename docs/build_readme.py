@@ -1,17 +1,36 @@
 """Build README.md from readme.ipynb with GitHub URLs for images."""
 
+import functools
 import glob
+import hashlib
+import json
 import os
 import re
-import shutil
 import subprocess
 
+import nbformat
+from nbconvert import MarkdownExporter
+from traitlets.config import Config
+
 # Paths
 DOCS_DIR = "docs"
 NOTEBOOK_PATH = os.path.join(DOCS_DIR, "readme.ipynb")
+MATPLOTLIBRC_PATH = os.path.join(DOCS_DIR, "matplotlibrc")
 README_PATH = "README.md"
 IMAGES_DIR = os.path.join(DOCS_DIR, "images")
 TEMP_FILES_DIR = "README_files"
+BUILD_CACHE_PATH = os.path.join(DOCS_DIR, ".build_cache.json")
+PACKAGE_DIR = "pygmrt"
+
+# GitHub remote URL (supports both HTTPS and SSH)
+# HTTPS: https://github.com/user/repo.git
+# SSH: git@github.com:user/repo.git
+GITHUB_REMOTE_PATTERN = re.compile(r"github\.com[:/](.+)/(.+?)(?:\.git)?$")
+
+# Local image references written by nbconvert
+IMAGE_REFERENCE_PATTERN = re.compile(
+    re.escape(TEMP_FILES_DIR) + r"/([\w.-]+\.svg)"
+)
 
 
 def get_github_repo_info():
@@ -26,11 +45,8 @@ def get_github_repo_info():
         )
         remote_url = result.stdout.strip()
 
-        # Parse GitHub URL (supports both HTTPS and SSH)
-        # HTTPS: https://github.com/user/repo.git
-        # SSH: git@github.com:user/repo.git
-        pattern = r"github\.com[:/](.+)/(.+?)(?:\.git)?$"
-        match = re.search(pattern, remote_url)
+        # Parse GitHub URL
+        match = GITHUB_REMOTE_PATTERN.search(remote_url)
 
         if not match:
             raise ValueError(f"Could not parse GitHub URL: {remote_url}")
@@ -53,8 +69,12 @@ def get_github_repo_info():
         raise RuntimeError(f"Failed to get git info: {e}")
 
 
+@functools.lru_cache(maxsize=None)
 def get_github_raw_url():
-    """Get the GitHub raw content URL for the current repository."""
+    """Get the GitHub raw content URL for the current repository.
+
+    Cached so that the git lookups run once per build.
+    """
     user, repo, branch = get_github_repo_info()
     return f"https://raw.githubusercontent.com/{user}/{repo}/{branch}"
 
@@ -77,58 +97,45 @@ def convert_notebook_to_markdown():
     # Clean old images first
     clean_existing_images()
 
-    # Run jupyter nbconvert with execution
-    result = subprocess.run(
-        [
-            "uv",
-            "run",
-            "jupyter",
-            "nbconvert",
-            "--to",
-            "markdown",
-            "--output",
-            "README",
-            "--output-dir",
-            ".",
-            "--execute",
-            NOTEBOOK_PATH,
-            '--ExtractOutputPreprocessor.extract_output_types={"image/svg+xml"}',
-        ],
-        capture_output=True,
-        text=True,
-    )
-
-    if result.returncode != 0:
-        print(f"Error: {result.stderr}")
+    # Execute and convert in-process (no jupyter CLI start-up)
+    config = Config()
+    config.ExecutePreprocessor.enabled = True
+    config.ExtractOutputPreprocessor.extract_output_types = {"image/svg+xml"}
+    exporter = MarkdownExporter(config=config)
+    notebook = nbformat.read(NOTEBOOK_PATH, as_version=4)
+    resources = {
+        "unique_key": "README",
+        "output_files_dir": TEMP_FILES_DIR,
+        "metadata": {"path": DOCS_DIR},
+    }
+    try:
+        body, resources = exporter.from_notebook_node(notebook, resources)
+    except Exception as e:
+        print(f"Error: {e}")
         return False
+
     print("Notebook executed and converted to markdown")
 
-    # Move images and update URLs
-    move_images_and_update_urls()
+    # Write images and README with GitHub URLs
+    body = write_images_and_update_urls(body, resources.get("outputs", {}))
+    with open(README_PATH, "w") as f:
+        f.write(body)
 
     return True
 
 
-def move_images_and_update_urls():
-    """Move images from temp directory to docs/images and update URLs."""
+def write_images_and_update_urls(readme_content, outputs):
+    """Write extracted images to docs/images and update their URLs.
 
-    if not os.path.exists(TEMP_FILES_DIR):
-        print("No images to move")
-        return
+    The image payloads are written straight to their final location, and
+    their local references are rewritten to GitHub URLs in a single pass
+    over the README content, which is returned.
+    """
+    if not outputs:
+        print("No images to write")
+        return readme_content
 
-    # Find all SVG files generated by nbconvert
-    svg_files = glob.glob(os.path.join(TEMP_FILES_DIR, "*.svg"))
-
-    if not svg_files:
-        shutil.rmtree(TEMP_FILES_DIR)
-        print("No SVG files found")
-        return
-
-    print(f"Moving {len(svg_files)} images...")
-
-    # Read README content
-    with open(README_PATH) as f:
-        readme_content = f.read()
+    print(f"Writing {len(outputs)} images...")
 
     # Create images directory
     os.makedirs(IMAGES_DIR, exist_ok=True)
@@ -136,28 +143,24 @@ def move_images_and_update_urls():
     # Get GitHub URL
     github_raw_url = get_github_raw_url()
 
-    # Move each image and update its URL in the README
-    for svg_file in svg_files:
-        filename = os.path.basename(svg_file)
-        destination = os.path.join(IMAGES_DIR, filename)
-
-        # Move file
-        shutil.move(svg_file, destination)
-
-        # Update markdown reference from local path to GitHub URL
-        local_path = f"{TEMP_FILES_DIR}/{filename}"
-        github_url = f"{github_raw_url}/docs/images/{filename}"
-        readme_content = readme_content.replace(local_path, github_url)
-
+    # Write each image
+    written = set()
+    for output_path, data in outputs.items():
+        filename = os.path.basename(output_path)
+        with open(os.path.join(IMAGES_DIR, filename), "wb") as f:
+            f.write(data)
+        written.add(filename)
         print(f"  - {filename}")
 
-    # Write updated README
-    with open(README_PATH, "w") as f:
-        f.write(readme_content)
+    # Update markdown references from local paths to GitHub URLs in one pass
+    def to_github_url(match):
+        filename = match.group(1)
+        if filename not in written:
+            return match.group(0)
+        return f"{github_raw_url}/docs/images/{filename}"
 
-    # Remove temp directory
-    shutil.rmtree(TEMP_FILES_DIR)
-    print("Images moved and URLs updated")
+    print("Images written and URLs updated")
+    return IMAGE_REFERENCE_PATTERN.sub(to_github_url, readme_content)
 
 
 def verify_images():
@@ -193,6 +196,60 @@ def verify_images():
     return True
 
 
+def hash_file(path):
+    """Return the BLAKE2 hex digest of a file's content."""
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read()).hexdigest()
+
+
+def hash_inputs():
+    """Hash the notebook, its figure style, this script and the sources."""
+    # The kernel runs in docs/, so docs/matplotlibrc styles every figure
+    sources = sorted(glob.glob(os.path.join(PACKAGE_DIR, "*.py")))
+    digest = hashlib.blake2b()
+    for path in [NOTEBOOK_PATH, MATPLOTLIBRC_PATH, __file__, *sources]:
+        digest.update(hash_file(path).encode())
+    return digest.hexdigest()
+
+
+def hash_images():
+    """Hash the generated images currently in the images directory."""
+    return {
+        os.path.basename(path): hash_file(path)
+        for path in sorted(glob.glob(os.path.join(IMAGES_DIR, "*.svg")))
+    }
+
+
+def is_up_to_date(inputs_hash):
+    """Check whether README.md was already built from the same inputs."""
+    if not os.path.exists(README_PATH) or not os.path.exists(BUILD_CACHE_PATH):
+        return False
+    try:
+        with open(BUILD_CACHE_PATH) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        # Unreadable or corrupt cache: rebuild
+        return False
+    if not isinstance(cache, dict):
+        return False
+    return (
+        cache.get("inputs_hash") == inputs_hash
+        and cache.get("readme_hash") == hash_file(README_PATH)
+        and cache.get("image_hashes") == hash_images()
+    )
+
+
+def write_build_cache(inputs_hash):
+    """Record the inputs, README and images of a successful build."""
+    cache = {
+        "inputs_hash": inputs_hash,
+        "readme_hash": hash_file(README_PATH),
+        "image_hashes": hash_images(),
+    }
+    with open(BUILD_CACHE_PATH, "w") as f:
+        json.dump(cache, f, indent=2)
+
+
 def main():
     """Build README.md from notebook."""
 
@@ -201,13 +258,22 @@ def main():
         print(f"Error: {DOCS_DIR}/ not found. Run from repository root.")
         return 1
 
+    # Skip the build if nothing changed since the last one
+    inputs_hash = hash_inputs()
+    if is_up_to_date(inputs_hash):
+        print("README.md is up to date")
+        return 0
+
     # Convert notebook and process images
     if not convert_notebook_to_markdown():
         print("\nBuild failed")
         return 1
 
-    # Verify images are correctly referenced
-    verify_images()
+    # Verify images are correctly referenced before caching the build
+    if not verify_images():
+        print("\nBuild failed")
+        return 1
+    write_build_cache(inputs_hash)
 
     print("README.md built successfully")
     return 0
@@ -14,19 +14,111 @@ Notes
 from __future__ import annotations
 
 import os
+import random
+import shutil
 import requests
 import rasterio
+import urllib3
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
+from rasterio.io import MemoryFile
+from rasterio.merge import merge
+from rasterio.transform import Affine
+from requests.adapters import HTTPAdapter
 from time import sleep
 from typing import List, Literal, Sequence, Tuple, TypedDict
+from urllib3.util.retry import Retry
 
 # Service endpoints
 GMRT_BASE_URL = "https://www.gmrt.org/services/GridServer"
+URL_TEMPLATE = (
+    GMRT_BASE_URL + "?format=geotiff"
+    "&west=%.6f&east=%.6f&south=%.6f&north=%.6f&resolution=%s"
+)
 
 # Default
 SAVE_DIRECTORY = "./geotiff"
 EXTENSION = "tif"
+CHUNK_SIZE = 1024 * 1024
+RESOLUTIONS = frozenset(("low", "medium", "high"))
+
+# GridServer names of the supported resolutions
+RESOLUTION_MAP = {"high": "high", "medium": "med", "low": "low"}
+
+# Leading bytes of classic TIFF and BigTIFF files (little and big endian)
+TIFF_SIGNATURES = (b"II*\x00", b"MM\x00*", b"II+\x00", b"MM\x00+")
+SNIFF_SIZE = 1024
+
+# Longitude segments narrower than this (degrees) are not requested
+MIN_WIDTH = 1e-9
+
+# Low-level flags for creating temporary download files exclusively
+# (binary mode matters on Windows)
+WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+TEMPORARY_ATTEMPTS = 16
+
+# Retry policy for transient HTTP errors
+RETRIES = 3
+BACKOFF = 0.5
+BACKOFF_CAP = 30.0
+RETRY_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+
+# Network errors (failed connection, timeout, or a stream dropped mid-body),
+# retried by the loop in _download_stream only: the session adapter retries
+# statuses alone, so that the two retry layers never multiply
+TRANSIENT_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    urllib3.exceptions.HTTPError,
+)
+
+# Subclasses of the above that will not recover (e.g. a certificate that
+# fails verification), raised immediately
+PERMANENT_ERRORS = (
+    requests.exceptions.SSLError,
+    urllib3.exceptions.SSLError,
+)
+
+
+class _CappedRetry(Retry):
+    """Retry policy that never waits longer than ``BACKOFF_CAP`` seconds.
+
+    urllib3 sleeps for the full ``Retry-After`` value sent by the server,
+    regardless of ``backoff_max``.
+    """
+
+    def get_retry_after(self, response) -> float | None:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, BACKOFF_CAP)
+
+
+# Shared HTTP session (connection pooling and keep-alive across requests,
+# exponential backoff with jitter on transient statuses, honours Retry-After
+# up to BACKOFF_CAP)
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        max_retries=_CappedRetry(
+            total=RETRIES,
+            connect=0,
+            read=0,
+            other=0,
+            backoff_factor=BACKOFF,
+            backoff_max=BACKOFF_CAP,
+            backoff_jitter=0.5,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=("GET",),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    ),
+)
 
 # Type aliases for clarity
 Resolution = Literal["low", "medium", "high"]
@@ -90,18 +182,25 @@ def download_tiles(
         If the destination directory is not writable.
     RuntimeError
         If download attempts ultimately fail.
+
+    Notes
+    -----
+    When the bbox crosses the antimeridian, both longitude segments are
+    downloaded concurrently and stitched into a single GeoTIFF. The eastern
+    segment is shifted by +360 degrees, so that the returned dataset spans
+    continuous longitudes from ``west`` to ``east + 360``.
     """
     # Validate bbox presence
     if bbox is None:
         raise ValueError("Provide bbox as [west, south, east, north]")
 
     # Validate resolution
-    if resolution not in ("low", "medium", "high"):
-        raise ValueError("Supported resolutions: 'low', 'medium', 'high'")
+    if resolution not in RESOLUTIONS:
+        supported = ", ".join(map(repr, sorted(RESOLUTIONS)))
+        raise ValueError(f"Supported resolutions: {supported}")
 
     # Output directory
     save_path = _check_directory(save_directory)
-    DownloadResult(entries=[])
 
     try:
         # Validate bbox values
@@ -109,26 +208,33 @@ def download_tiles(
 
         # Split antimeridian into 1 or 2 ranges
         longitude_limits = _split_antimeridian(west, east)
+        if not longitude_limits:
+            raise ValueError("bbox has zero longitude width")
+
+        # Download all segments concurrently (network-bound)
+        process = partial(
+            _process_one,
+            south=south,
+            north=north,
+            save_path=save_path,
+            resolution=resolution,
+            overwrite=overwrite,
+        )
+        with ThreadPoolExecutor(len(longitude_limits)) as executor:
+            entries = list(executor.map(process, longitude_limits))
 
-        # For simplicity, use the first longitude segment and return its dataset
-        # (Most common case is no antimeridian crossing = single segment)
-        lon_a, lon_b = longitude_limits[0]
-
-        # Build URL
-        url = _build_url(lon_a, south, lon_b, north, resolution)
+        # Most common case is no antimeridian crossing = single segment
+        if len(entries) == 1:
+            return rasterio.open(entries[0].path)
 
-        # Determine file path (include resolution in filename to force re-download when resolution changes)
+        # Stitch both sides of the antimeridian into a single file
         filename = _save_filename(
-            "gmrt", (lon_a, south, lon_b, north), resolution=resolution
+            "gmrt", (west, south, east + 360.0, north), resolution=resolution
         )
         filepath = save_path / filename
-
-        # Download if needed
-        if not filepath.exists() or overwrite:
-            print(f"Downloading {url} to {filepath} ...")
-            _download_stream(url, filepath, overwrite=overwrite)
-
-        # Open and return the rasterio dataset
+        created = any(entry.status == "created" for entry in entries)
+        if overwrite or created or _stat_or_none(filepath) is None:
+            _merge_segments([entry.path for entry in entries], filepath)
         return rasterio.open(filepath)
 
     except Exception as e:
@@ -212,12 +318,15 @@ def _split_antimeridian(
     Returns
     -------
     list of tuple of float
-        One or two ranges ``[(west, east), ...]`` depending on whether the
-        interval crosses the antimeridian.
+        Zero, one or two ranges ``[(west, east), ...]`` depending on whether
+        the interval crosses the antimeridian. Degenerate ranges narrower
+        than ``MIN_WIDTH`` are dropped so they never reach the server.
     """
     if min_lon <= max_lon:
-        return [(min_lon, max_lon)]
-    return [(min_lon, 180.0), (-180.0, max_lon)]
+        ranges = [(min_lon, max_lon)]
+    else:
+        ranges = [(min_lon, 180.0), (-180.0, max_lon)]
+    return [(west, east) for west, east in ranges if east - west >= MIN_WIDTH]
 
 
 def _save_filename(
@@ -278,13 +387,131 @@ def _check_directory(directory: str | Path) -> Path:
     return path
 
 
+def _process_one(
+    longitude_limits: Tuple[float, float],
+    south: float,
+    north: float,
+    *,
+    save_path: Path,
+    resolution: Resolution = "medium",
+    overwrite: bool = False,
+) -> ManifestEntry:
+    """Download a single longitude segment unless it already exists.
+
+    Parameters
+    ----------
+    longitude_limits : tuple of float
+        Segment longitudes ``(west, east)`` in degrees, not crossing the
+        antimeridian.
+    south, north : float
+        Segment latitudes in degrees.
+    save_path : pathlib.Path
+        Existing destination directory.
+    resolution : {"low", "medium", "high"}, default "medium"
+        Named resolution level.
+    overwrite : bool, default False
+        If ``False``, reuse existing file. If ``True``, force re-download.
+
+    Returns
+    -------
+    ManifestEntry
+        Entry describing the segment file and whether it was created or
+        reused.
+    """
+    west, east = longitude_limits
+    coverage = BoundingBox(west=west, south=south, east=east, north=north)
+
+    # Determine file path (include resolution in filename to force re-download when resolution changes)
+    filename = _save_filename(
+        "gmrt", (west, south, east, north), resolution=resolution
+    )
+    filepath = save_path / filename
+
+    # Reuse if possible (single stat call)
+    stat = None if overwrite else _stat_or_none(filepath)
+    if stat is not None:
+        return ManifestEntry(
+            path=str(filepath),
+            coverage=coverage,
+            size_bytes=stat.st_size,
+            status="reused",
+        )
+
+    # Download (existence already checked, so don't stat again)
+    url = _build_url(west, south, east, north, resolution)
+    print(f"Downloading {url} to {filepath} ...")
+    size = _download_stream(url, filepath, overwrite=True)
+    return ManifestEntry(
+        path=str(filepath),
+        coverage=coverage,
+        size_bytes=size,
+        status="created",
+    )
+
+
+def _merge_segments(paths: Sequence[str], filepath: Path) -> None:
+    """Stitch the two segments of an antimeridian-crossing bbox.
+
+    Parameters
+    ----------
+    paths : sequence of str
+        GeoTIFF paths of the western and eastern segments, in that order.
+    filepath : pathlib.Path
+        Target file path of the mosaic, written atomically.
+
+    Notes
+    -----
+    The eastern segment is shifted by +360 degrees before merging, so that
+    the mosaic has continuous longitudes across the antimeridian.
+    """
+    west_path, east_path = paths
+    tmp, fd = _create_temporary(filepath)
+    os.close(fd)
+    try:
+        with (
+            rasterio.open(west_path) as west,
+            rasterio.open(east_path) as east,
+        ):
+            a, b, c, d, e, f = east.transform[:6]
+            profile = east.profile
+            profile["transform"] = Affine(a, b, c + 360.0, d, e, f)
+            with MemoryFile() as memfile:
+                with memfile.open(**profile) as shifted:
+                    shifted.write(east.read())
+                with memfile.open() as shifted:
+                    merge([west, shifted], dst_path=tmp)
+        os.replace(tmp, filepath)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    """Return the stat result of a path, or ``None`` if it does not exist.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Path to inspect.
+
+    Returns
+    -------
+    os.stat_result or None
+        Result of a single ``stat`` call, or ``None`` if the file is missing.
+    """
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
 def _download_stream(
     url: str,
     filepath: Path,
     *,
     timeout: float = 30.0,
-    retries: int = 3,
-    backoff: float = 0.5,
+    retries: int = RETRIES,
+    backoff: float = BACKOFF,
+    cap: float = BACKOFF_CAP,
     overwrite: bool = False,
 ) -> int:
     """Download a URL to a file, atomically and with streaming.
@@ -294,14 +521,22 @@ def _download_stream(
     url : str
         Source URL to fetch.
     filepath : pathlib.Path
-        Target file path to write. A temporary ``.part`` is used and atomically
-        moved into place on completion.
+        Target file path to write. A uniquely named temporary ``.part`` file
+        is created exclusively next to it and atomically moved into place on
+        completion, so concurrent downloads of the same file never share it.
     timeout : float, default 30.0
         Per-request timeout in seconds.
     retries : int, default 3
-        Number of retry attempts on failures.
+        Number of retry attempts when the connection fails, times out, or
+        drops while the body is streamed. Transient HTTP statuses are retried
+        separately by the session adapter, which does not retry these errors.
     backoff : float, default 0.5
-        Linear backoff multiplier between retries, in seconds.
+        Base delay of the exponential backoff between retries, in seconds.
+        The wait before the ``n``-th retry is drawn uniformly in
+        ``[0, min(cap, backoff * 2**(n - 1))]`` (full jitter), so that
+        concurrent clients do not retry in lockstep.
+    cap : float, default 30.0
+        Upper bound of a single backoff wait, in seconds.
     overwrite : bool, default False
         If ``False``, reuse existing file. If ``True``, force re-download.
 
@@ -313,64 +548,130 @@ def _download_stream(
     Raises
     ------
     RuntimeError
-        When the HTTP response indicates an error or returns a text/JSON/HTML payload
-        instead of a binary raster file.
+        When the HTTP response indicates an error or returns a payload that is
+        not a TIFF file (e.g. a text/JSON/HTML error page).
+    requests.exceptions.SSLError
+        Immediately, when the TLS connection cannot be established.
+    requests.ConnectionError, requests.Timeout, urllib3.exceptions.HTTPError
+        When the connection still fails, times out or drops mid-body (e.g.
+        ``urllib3.exceptions.ReadTimeoutError``) after ``retries`` attempts.
     """
-    # Skip if exists and not overwriting
-    if filepath.exists() and not overwrite:
-        return filepath.stat().st_size
+    # Skip if exists and not overwriting (single stat call)
+    stat = None if overwrite else _stat_or_none(filepath)
+    if stat is not None:
+        return stat.st_size
 
-    # Temporary file path
-    tmp = filepath.with_suffix(filepath.suffix + ".part")
+    # Temporary files go next to the target so the final move is atomic
+    filepath.parent.mkdir(parents=True, exist_ok=True)
     attempt = 0
     while True:
+        tmp = None
         try:
-            with requests.get(url, stream=True, timeout=timeout) as r:
+            with _SESSION.get(url, stream=True, timeout=timeout) as r:
+                r.raw.decode_content = True
                 try:
                     r.raise_for_status()
                 except Exception as http_err:
-                    # include response status and a part of the body for help
-                    content_preview = None
+                    # include response status and the start of the body for
+                    # help, without loading the whole body
                     try:
-                        content_preview = r.text[:1024]
+                        content_preview = r.raw.read(SNIFF_SIZE).decode(
+                            "utf-8", errors="replace"
+                        )
                     except Exception:
                         content_preview = "<unavailable>"
                     raise RuntimeError(
                         f"HTTP error while downloading {url}: {r.status_code} {r.reason}\nResponse preview: {content_preview}"
                     ) from http_err
-                # Check content-type to ensure we're not saving an HTML error page
-                ctype = (r.headers.get("Content-Type") or "").lower()
-                if any(
-                    t in ctype
-                    for t in ["text/html", "text/plain", "application/json"]
-                ):
-                    preview = None
-                    try:
-                        preview = r.text[:1024]
-                    except Exception:
-                        preview = "<unavailable>"
+                # Sniff the TIFF signature to ensure we're not saving an
+                # HTML/JSON error page, whatever the declared content-type
+                head = r.raw.read(SNIFF_SIZE)
+                if head[:4] not in TIFF_SIGNATURES:
+                    ctype = r.headers.get("Content-Type") or "unknown"
+                    preview = head.decode("utf-8", errors="replace")
                     raise RuntimeError(
-                        f"Unexpected content-type {ctype} for {url}. Response preview: {preview}"
+                        f"Response from {url} is not a GeoTIFF (content-type {ctype}). Response preview: {preview}"
                     )
-                tmp.parent.mkdir(parents=True, exist_ok=True)
-                with open(tmp, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=1024 * 64):
-                        if chunk:
-                            f.write(chunk)
+                tmp, fd = _create_temporary(filepath)
+                with os.fdopen(fd, "wb", buffering=CHUNK_SIZE) as f:
+                    if "Content-Encoding" not in r.headers:
+                        size = int(r.headers.get("Content-Length") or 0)
+                        _preallocate(fd, size)
+                    f.write(head)
+                    shutil.copyfileobj(r.raw, f, CHUNK_SIZE)
+                    total = f.tell()
+                    # Drop any preallocated space beyond a short body
+                    f.truncate()
             # Atomic replace
-            tmp.replace(filepath)
-            return filepath.stat().st_size
-        except Exception:
+            os.replace(tmp, filepath)
+            tmp = None
+            return total
+        except PERMANENT_ERRORS:
+            raise
+        except TRANSIENT_ERRORS:
             attempt += 1
-            try:
-                if tmp.exists():
-                    tmp.unlink()
-            except Exception:
-                # Best-effort cleanup
-                pass
             if attempt > retries:
                 raise
-            sleep(backoff * attempt)
+        finally:
+            # Remove the partial file on any failure, including interrupts
+            if tmp is not None:
+                try:
+                    tmp.unlink(missing_ok=True)
+                except OSError:
+                    # Best-effort cleanup
+                    pass
+        sleep(random.uniform(0, min(cap, backoff * 2 ** (attempt - 1))))
+
+
+def _create_temporary(filepath: Path) -> Tuple[Path, int]:
+    """Exclusively create a temporary file next to a download target.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path
+        Final path of the download.
+
+    Returns
+    -------
+    tuple of (pathlib.Path, int)
+        Path of the temporary file and its file descriptor, open for writing.
+
+    Raises
+    ------
+    FileExistsError
+        If no free temporary name was found.
+    """
+    for index in range(TEMPORARY_ATTEMPTS):
+        tmp = filepath.with_name(f"{filepath.name}.part.{os.getpid()}.{index}")
+        try:
+            return tmp, os.open(tmp, WRITE_FLAGS, 0o666)
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No free temporary file name for {filepath}")
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserve contiguous disk space for a file of known size.
+
+    Parameters
+    ----------
+    fd : int
+        File descriptor open for writing.
+    size : int
+        Expected file size in bytes. Nothing is done if not positive.
+
+    Notes
+    -----
+    Uses ``os.posix_fallocate`` where available (Linux and most Unix). On
+    other platforms, or filesystems that do not support it, the file simply
+    grows as it is written.
+    """
+    if size <= 0 or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError:
+        pass
 
 
 def _map_resolution(res: Resolution) -> str:
@@ -385,12 +686,7 @@ def _map_resolution(res: Resolution) -> str:
     - "medium": 4 (moderate resolution)
     - "low": 16 (lower resolution, larger grid size)
     """
-    mapping = {
-        "high": "high",
-        "medium": "med",
-        "low": "low",
-    }
-    return mapping[res]
+    return RESOLUTION_MAP[res]
 
 
 def _build_url(
@@ -417,6 +713,10 @@ def _build_url(
     currently included in the URL but may not affect the server response.
     Different filenames based on resolution ensure proper caching behavior.
 
+    Coordinates are written with 6 decimals (about 11 cm at the equator, finer
+    than any GMRT resolution) so that equivalent requests share one canonical
+    URL.
+
     Raises
     ------
     ValueError
@@ -425,4 +725,4 @@ def _build_url(
     """
     # Map resolution for potential future use
     mapped_res = _map_resolution(res)
-    return f"{GMRT_BASE_URL}?format=geotiff&west={west}&east={east}&south={south}&north={north}&resolution={mapped_res}"
+    return URL_TEMPLATE % (west, east, south, north, mapped_res)
@@ -2,6 +2,7 @@
 
 import tempfile
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -13,6 +14,21 @@ def temp_dir():
         yield Path(tmpdir)
 
 
+@pytest.fixture
+def mock_download():
+    """Patch the network download so that no request is sent."""
+    with patch("pygmrt.tiles._download_stream") as mock:
+        yield mock
+
+
+@pytest.fixture
+def mock_raster_open():
+    """Patch rasterio.open to return a mock dataset."""
+    with patch("pygmrt.tiles.rasterio.open") as mock:
+        mock.return_value = MagicMock()
+        yield mock
+
+
 @pytest.fixture
 def valid_bbox():
     """Provide a valid bounding box for testing."""
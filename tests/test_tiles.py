@@ -1,12 +1,19 @@
 """Tests for pygmrt.tiles module."""
 
+import io
 import os
 import tempfile
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
 
 import pytest
+import numpy as np
 import rasterio
+import requests
+from hypothesis import assume, given, settings
+from hypothesis import strategies as st
+from rasterio.transform import Affine
 
 from pygmrt.tiles import (
     BoundingBox,
@@ -16,13 +23,45 @@ from pygmrt.tiles import (
     get_path,
 )
 from pygmrt.tiles import (
+    BACKOFF_CAP,
+    GMRT_BASE_URL,
+    MIN_WIDTH,
+    RETRIES,
+    _SESSION,
     _build_url,
     _check_directory,
+    _download_stream,
+    _merge_segments,
     _save_filename,
     _split_antimeridian,
     _validate_bbox,
 )
 
+longitudes = st.floats(-180.0, 180.0)
+latitudes = st.floats(-90.0, 90.0)
+
+
+class FakeResponse:
+    """Minimal stand-in for a streamed requests response."""
+
+    def __init__(self, content=b"II*\x00data", status_code=200, headers=None):
+        self.raw = io.BytesIO(content)
+        self.status_code = status_code
+        self.reason = "OK" if status_code < 400 else "Error"
+        self.headers = (
+            {"Content-Type": "image/tiff"} if headers is None else headers
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} {self.reason}")
+
 
 class TestValidateBbox:
     """Tests for _validate_bbox function."""
@@ -71,6 +110,14 @@ class TestValidateBbox:
         assert east == -100.0
         assert north == -30.0
 
+    @settings(max_examples=50)
+    @given(longitudes, latitudes, longitudes, latitudes)
+    def test_valid_bbox_properties(self, west, south, east, north):
+        """Test that any in-range bbox with south < north is returned."""
+        assume(south < north)
+        result = _validate_bbox([west, south, east, north])
+        assert result == (west, south, east, north)
+
 
 class TestSplitAntimeridian:
     """Tests for _split_antimeridian function."""
@@ -88,14 +135,24 @@ class TestSplitAntimeridian:
     def test_exactly_at_antimeridian(self):
         """Test longitude range exactly at antimeridian."""
         result = _split_antimeridian(180.0, -180.0)
-        assert result == [(180.0, 180.0), (-180.0, -180.0)]
-
-    def test_full_circle(self):
-        """Test longitude range covering almost full circle."""
-        result = _split_antimeridian(170.0, -170.0)
-        assert len(result) == 2
-        assert result[0] == (170.0, 180.0)
-        assert result[1] == (-180.0, -170.0)
+        assert result == []
+
+    def test_degenerate_segment_dropped(self):
+        """Test zero-width segment at the antimeridian is dropped."""
+        result = _split_antimeridian(180.0, -170.0)
+        assert result == [(-180.0, -170.0)]
+
+    @settings(max_examples=50)
+    @given(longitudes, longitudes)
+    def test_split_properties(self, west, east):
+        """Test that split ranges are ordered and cover the input width."""
+        result = _split_antimeridian(west, east)
+        width = east - west if west <= east else 360.0 + east - west
+        assert len(result) <= 2
+        for segment_west, segment_east in result:
+            assert -180.0 <= segment_west < segment_east <= 180.0
+        covered = sum(e - w for w, e in result)
+        assert covered == pytest.approx(width, abs=2 * MIN_WIDTH)
 
 
 class TestSaveFilename:
@@ -132,6 +189,13 @@ class TestSaveFilename:
         assert "-120.500" in filename
         assert "-50.500" in filename
 
+    def test_filename_independent_of_history(self):
+        """Test that signed zeros are formatted as given on every call."""
+        positive = _save_filename("gmrt", (0.0, 1.0, 2.0, 3.0))
+        negative = _save_filename("gmrt", (-0.0, 1.0, 2.0, 3.0))
+        assert positive.startswith("gmrt_medium_0.000_")
+        assert negative.startswith("gmrt_medium_-0.000_")
+
 
 class TestCheckDirectory:
     """Tests for _check_directory function."""
@@ -171,30 +235,249 @@ class TestCheckDirectory:
 class TestBuildUrl:
     """Tests for _build_url function."""
 
-    def test_url_generation_medium(self):
-        """Test URL generation with medium resolution."""
-        url = _build_url(10.0, 20.0, 30.0, 40.0, "medium")
-        assert "www.gmrt.org/services/GridServer" in url
-        assert "format=geotiff" in url
-        assert "resolution=med" in url
-
-    def test_url_generation_low(self):
-        """Test URL generation with low resolution."""
-        url = _build_url(10.0, 20.0, 30.0, 40.0, "low")
-        assert "www.gmrt.org/services/GridServer" in url
-
-    def test_url_generation_high(self):
-        """Test URL generation with high resolution."""
-        url = _build_url(10.0, 20.0, 30.0, 40.0, "high")
-        assert "www.gmrt.org/services/GridServer" in url
+    @pytest.mark.parametrize(
+        "resolution, mapped",
+        [("low", "low"), ("medium", "med"), ("high", "high")],
+    )
+    def test_url_generation(self, resolution, mapped):
+        """Test URL generation for each resolution."""
+        url = _build_url(10.0, 20.0, 30.0, 40.0, resolution)
+        parsed = urlparse(url)
+        query = parse_qs(parsed.query)
+        assert (
+            parsed.netloc + parsed.path == "www.gmrt.org/services/GridServer"
+        )
+        assert query["format"] == ["geotiff"]
+        assert query["resolution"] == [mapped]
 
     def test_url_contains_bbox(self):
         """Test that URL contains bbox parameters."""
         url = _build_url(10.5, 20.5, 30.5, 40.5, "medium")
-        assert "10.5" in url
-        assert "20.5" in url
-        assert "30.5" in url
-        assert "40.5" in url
+        query = parse_qs(urlparse(url).query)
+        assert float(query["west"][0]) == 10.5
+        assert float(query["south"][0]) == 20.5
+        assert float(query["east"][0]) == 30.5
+        assert float(query["north"][0]) == 40.5
+
+    def test_url_coordinates_canonical(self):
+        """Test that coordinates are written with fixed precision."""
+        url = _build_url(0.1 + 0.2, 20.0, 30.0, 40.0, "medium")
+        query = parse_qs(urlparse(url).query)
+        assert query["west"] == ["0.300000"]
+        assert query["south"] == ["20.000000"]
+
+
+class TestDownloadStream:
+    """Tests for _download_stream function."""
+
+    @patch("pygmrt.tiles._SESSION.get")
+    def test_writes_file(self, mock_get, temp_dir):
+        """Test streamed content is written to the target file."""
+        mock_get.return_value = FakeResponse(b"II*\x00" + b"x" * 100)
+        filepath = temp_dir / "tile.tif"
+
+        size = _download_stream("https://example.org", filepath)
+
+        assert size == 104
+        assert filepath.read_bytes() == b"II*\x00" + b"x" * 100
+        assert list(temp_dir.iterdir()) == [filepath]
+
+    @patch("pygmrt.tiles._SESSION.get")
+    def test_untyped_geotiff_accepted(self, mock_get, temp_dir):
+        """Test GeoTIFFs are recognized by signature, not content-type."""
+        mock_get.return_value = FakeResponse(
+            b"MM\x00*data",
+            headers={"Content-Type": "application/octet-stream"},
+        )
+        filepath = temp_dir / "tile.tif"
+
+        _download_stream("https://example.org", filepath)
+
+        assert filepath.read_bytes() == b"MM\x00*data"
+
+    @patch("pygmrt.tiles._SESSION.get")
+    def test_short_body_truncates_preallocation(self, mock_get, temp_dir):
+        """Test the file matches the body when Content-Length overstates it."""
+        mock_get.return_value = FakeResponse(
+            b"II*\x00data",
+            headers={"Content-Type": "image/tiff", "Content-Length": "1000"},
+        )
+        filepath = temp_dir / "tile.tif"
+
+        size = _download_stream("https://example.org", filepath)
+
+        assert size == 8
+        assert filepath.read_bytes() == b"II*\x00data"
+
+    @patch("pygmrt.tiles._SESSION.get")
+    def test_shared_session(self, mock_get, temp_dir):
+        """Test downloads stream through the shared session."""
+        mock_get.return_value = FakeResponse()
+        filepath = temp_dir / "tile.tif"
+
+        _download_stream("https://example.org", filepath, timeout=5.0)
+
+        mock_get.assert_called_once_with(
+            "https://example.org", stream=True, timeout=5.0
+        )
+        assert filepath.exists()
+
+    @patch("pygmrt.tiles._SESSION.get")
+    def test_concurrent_temporary_preserved(self, mock_get, temp_dir):
+        """Test another writer's temporary file is never clobbered."""
+        mock_get.return_value = FakeResponse()
+        filepath = temp_dir / "tile.tif"
+        other = filepath.with_suffix(f".tif.part.{os.getpid()}.0")
+        other.write_bytes(b"other writer")
+
+        _download_stream("https://example.org", filepath)
+
+        assert filepath.read_bytes() == b"II*\x00data"
+        assert other.read_bytes() == b"other writer"
+
+    @patch("pygmrt.tiles._preallocate", side_effect=KeyboardInterrupt)
+    @patch("pygmrt.tiles._SESSION.get")
+    def test_interrupt_removes_temporary(
+        self, mock_get, mock_preallocate, temp_dir
+    ):
+        """Test an interrupted download leaves no temporary file behind."""
+        mock_get.return_value = FakeResponse()
+        filepath = temp_dir / "tile.tif"
+
+        with pytest.raises(KeyboardInterrupt):
+            _download_stream("https://example.org", filepath)
+
+        mock_preallocate.assert_called_once()
+        assert list(temp_dir.iterdir()) == []
+
+    @patch("pygmrt.tiles._SESSION.get")
+    def test_existing_file_reused(self, mock_get, temp_dir):
+        """Test existing file is not downloaded again."""
+        filepath = temp_dir / "tile.tif"
+        filepath.write_bytes(b"cached")
+
+        size = _download_stream("https://example.org", filepath)
+
+        assert size == 6
+        mock_get.assert_not_called()
+
+    @patch("pygmrt.tiles.sleep")
+    @patch("pygmrt.tiles._SESSION.get")
+    def test_html_payload_rejected(self, mock_get, mock_sleep, temp_dir):
+        """Test HTML error pages are not saved as rasters."""
+        mock_get.return_value = FakeResponse(
+            b"<html>error</html>", headers={"Content-Type": "text/html"}
+        )
+        filepath = temp_dir / "tile.tif"
+
+        with pytest.raises(RuntimeError, match="not a GeoTIFF"):
+            _download_stream("https://example.org", filepath, retries=0)
+
+        assert list(temp_dir.iterdir()) == []
+
+    @patch("pygmrt.tiles.sleep")
+    @patch("pygmrt.tiles._SESSION.get")
+    def test_http_error_not_retried(self, mock_get, mock_sleep, temp_dir):
+        """Test HTTP errors surface without a Python-level retry."""
+        mock_get.return_value = FakeResponse(b"not found", status_code=404)
+
+        with pytest.raises(RuntimeError, match="HTTP error(.|\n)*not found"):
+            _download_stream("https://example.org", temp_dir / "tile.tif")
+
+        assert mock_get.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch("pygmrt.tiles.sleep")
+    @patch("pygmrt.tiles._SESSION.get")
+    def test_connection_error_retried(self, mock_get, mock_sleep, temp_dir):
+        """Test dropped connections are retried."""
+        mock_get.side_effect = [requests.ConnectionError(), FakeResponse()]
+        filepath = temp_dir / "tile.tif"
+
+        _download_stream("https://example.org", filepath)
+
+        assert mock_get.call_count == 2
+        assert filepath.exists()
+        assert 0.0 <= mock_sleep.call_args.args[0] <= 0.5
+
+    @patch("pygmrt.tiles.sleep")
+    @patch("pygmrt.tiles._SESSION.get")
+    def test_connection_error_retry_budget(
+        self, mock_get, mock_sleep, temp_dir
+    ):
+        """Test persistent connection failures stop after the retries."""
+        mock_get.side_effect = requests.ConnectionError()
+
+        with pytest.raises(requests.ConnectionError):
+            _download_stream("https://example.org", temp_dir / "tile.tif")
+
+        assert mock_get.call_count == RETRIES + 1
+
+    @patch("pygmrt.tiles.sleep")
+    @patch("pygmrt.tiles._SESSION.get")
+    def test_ssl_error_not_retried(self, mock_get, mock_sleep, temp_dir):
+        """Test certificate failures are raised without retrying."""
+        mock_get.side_effect = requests.exceptions.SSLError()
+
+        with pytest.raises(requests.exceptions.SSLError):
+            _download_stream("https://example.org", temp_dir / "tile.tif")
+
+        assert mock_get.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_adapter_retries_statuses_only(self):
+        """Test the session adapter leaves network errors to the loop."""
+        retry = _SESSION.get_adapter(GMRT_BASE_URL).max_retries
+        assert retry.connect == 0
+        assert retry.read == 0
+        assert retry.other == 0
+        assert retry.total == RETRIES
+
+    def test_retry_after_capped(self):
+        """Test a long Retry-After header is capped."""
+        retry = _SESSION.get_adapter(GMRT_BASE_URL).max_retries
+        response = Mock(headers={"Retry-After": "3600"})
+        assert retry.get_retry_after(response) == BACKOFF_CAP
+
+
+class TestMergeSegments:
+    """Tests for _merge_segments function."""
+
+    @staticmethod
+    def write_segment(path, west, values):
+        """Write a 2x2 GeoTIFF of 5-degree pixels from ``west``, 10N."""
+        profile = dict(
+            driver="GTiff",
+            width=2,
+            height=2,
+            count=1,
+            dtype="float32",
+            crs="EPSG:4326",
+            transform=Affine(5.0, 0.0, west, 0.0, -5.0, 10.0),
+        )
+        with rasterio.open(path, "w", **profile) as dataset:
+            dataset.write(np.full((1, 2, 2), values, dtype="float32"))
+        return str(path)
+
+    def test_merge_across_antimeridian(self, temp_dir):
+        """Test that the eastern segment is shifted by +360 degrees."""
+        paths = [
+            self.write_segment(temp_dir / "west.tif", 170.0, 1.0),
+            self.write_segment(temp_dir / "east.tif", -180.0, 2.0),
+        ]
+        filepath = temp_dir / "merged.tif"
+        _merge_segments(paths, filepath)
+
+        with rasterio.open(filepath) as dataset:
+            assert tuple(dataset.bounds) == (170.0, 0.0, 190.0, 10.0)
+            data = dataset.read(1)
+        np.testing.assert_array_equal(data[:, :2], 1.0)
+        np.testing.assert_array_equal(data[:, 2:], 2.0)
+        assert sorted(p.name for p in temp_dir.iterdir()) == [
+            "east.tif",
+            "merged.tif",
+            "west.tif",
+        ]
 
 
 class TestDownloadTiles:
@@ -210,52 +493,51 @@ class TestDownloadTiles:
         with pytest.raises(ValueError, match="Supported resolutions"):
             download_tiles(bbox=[10.0, 20.0, 30.0, 40.0], resolution="ultra")
 
-    @patch("pygmrt.tiles._download_stream")
-    @patch("pygmrt.tiles.rasterio.open")
-    def test_successful_download(self, mock_raster_open, mock_download):
-        """Test successful tile download."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Mock rasterio dataset
-            mock_dataset = MagicMock()
-            mock_dataset.name = "test.tif"
-            mock_dataset.crs = "EPSG:4326"
-            mock_dataset.shape = (100, 100)
-            mock_raster_open.return_value = mock_dataset
-
-            # Download tiles
-            result = download_tiles(
-                bbox=[10.0, 20.0, 30.0, 40.0],
-                save_directory=tmpdir,
-                resolution="low",
+    def test_zero_width_bbox(self, mock_download, temp_dir):
+        """Test download_tiles with a zero-width longitude range."""
+        with pytest.raises(RuntimeError, match="zero longitude width"):
+            download_tiles(
+                bbox=[180.0, 20.0, -180.0, 40.0], save_directory=temp_dir
             )
+        mock_download.assert_not_called()
 
-            assert result is not None
-            mock_download.assert_called_once()
-
-    @patch("pygmrt.tiles._download_stream")
-    @patch("pygmrt.tiles.rasterio.open")
-    def test_overwrite_parameter(self, mock_raster_open, mock_download):
-        """Test overwrite parameter functionality."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mock_dataset = MagicMock()
-            mock_raster_open.return_value = mock_dataset
+    def test_successful_download(
+        self, mock_raster_open, mock_download, temp_dir
+    ):
+        """Test successful tile download."""
+        mock_dataset = mock_raster_open.return_value
+        mock_dataset.name = "test.tif"
+        mock_dataset.crs = "EPSG:4326"
+        mock_dataset.shape = (100, 100)
+
+        # Download tiles
+        result = download_tiles(
+            bbox=[10.0, 20.0, 30.0, 40.0],
+            save_directory=temp_dir,
+            resolution="low",
+        )
 
-            # Create an existing file
-            save_path = Path(tmpdir)
-            filename = _save_filename(
-                "gmrt", (10.0, 20.0, 30.0, 40.0), resolution="low"
-            )
-            existing_file = save_path / filename
-            existing_file.touch()
+        assert result is mock_dataset
+        mock_download.assert_called_once()
 
-            # Download without overwrite - should not download
-            download_tiles(
-                bbox=[10.0, 20.0, 30.0, 40.0],
-                save_directory=tmpdir,
-                resolution="low",
-                overwrite=False,
-            )
-            mock_download.assert_not_called()
+    def test_overwrite_parameter(
+        self, mock_raster_open, mock_download, temp_dir
+    ):
+        """Test overwrite parameter functionality."""
+        # Create an existing file
+        filename = _save_filename(
+            "gmrt", (10.0, 20.0, 30.0, 40.0), resolution="low"
+        )
+        (temp_dir / filename).touch()
+
+        # Download without overwrite - should not download
+        download_tiles(
+            bbox=[10.0, 20.0, 30.0, 40.0],
+            save_directory=temp_dir,
+            resolution="low",
+            overwrite=False,
+        )
+        mock_download.assert_not_called()
 
     def test_invalid_bbox_in_download(self):
         """Test download_tiles with invalid bbox values."""
@@ -330,57 +612,85 @@ class TestGetPath:
 class TestIntegrationScenarios:
     """Integration tests for common usage scenarios."""
 
-    @patch("pygmrt.tiles._download_stream")
-    @patch("pygmrt.tiles.rasterio.open")
-    def test_la_reunion_download(self, mock_raster_open, mock_download):
+    def test_la_reunion_download(
+        self, mock_raster_open, mock_download, temp_dir, la_reunion_bbox
+    ):
         """Test downloading La Réunion Island area."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mock_dataset = MagicMock()
-            mock_dataset.name = "la_reunion.tif"
-            mock_dataset.crs = "EPSG:4326"
-            mock_raster_open.return_value = mock_dataset
-
-            # La Réunion bbox
-            result = download_tiles(
-                bbox=[55.05, -21.5, 55.95, -20.7],
-                save_directory=tmpdir,
-                resolution="low",
-            )
-
-            assert result is not None
-            mock_download.assert_called_once()
+        mock_dataset = mock_raster_open.return_value
+        mock_dataset.name = "la_reunion.tif"
+        mock_dataset.crs = "EPSG:4326"
+
+        result = download_tiles(
+            bbox=la_reunion_bbox,
+            save_directory=temp_dir,
+            resolution="low",
+        )
 
-    @patch("pygmrt.tiles._download_stream")
-    @patch("pygmrt.tiles.rasterio.open")
-    def test_antimeridian_crossing(self, mock_raster_open, mock_download):
+        assert result is mock_dataset
+        mock_download.assert_called_once()
+
+    @patch("pygmrt.tiles._merge_segments")
+    def test_antimeridian_crossing(
+        self,
+        mock_merge,
+        mock_raster_open,
+        mock_download,
+        temp_dir,
+        antimeridian_bbox,
+    ):
         """Test downloading area crossing the antimeridian."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mock_dataset = MagicMock()
-            mock_raster_open.return_value = mock_dataset
+        result = download_tiles(
+            bbox=antimeridian_bbox,
+            save_directory=temp_dir,
+            resolution="low",
+        )
 
-            # Bbox crossing antimeridian
+        assert result is not None
+        assert mock_download.call_count == 2
+        segments = [
+            str(temp_dir / _save_filename("gmrt", bbox, resolution="low"))
+            for bbox in [
+                (170.0, -10.0, 180.0, 10.0),
+                (-180.0, -10.0, -170.0, 10.0),
+            ]
+        ]
+        merged = temp_dir / _save_filename(
+            "gmrt", (170.0, -10.0, 190.0, 10.0), resolution="low"
+        )
+        mock_merge.assert_called_once_with(segments, merged)
+        mock_raster_open.assert_called_once_with(merged)
+
+    @patch("pygmrt.tiles._merge_segments")
+    def test_antimeridian_reused(
+        self,
+        mock_merge,
+        mock_raster_open,
+        mock_download,
+        temp_dir,
+        antimeridian_bbox,
+    ):
+        """Test that an existing mosaic and its segments are reused."""
+        for bbox in [
+            (170.0, -10.0, 180.0, 10.0),
+            (-180.0, -10.0, -170.0, 10.0),
+            (170.0, -10.0, 190.0, 10.0),
+        ]:
+            (temp_dir / _save_filename("gmrt", bbox)).touch()
+
+        download_tiles(bbox=antimeridian_bbox, save_directory=temp_dir)
+
+        mock_download.assert_not_called()
+        mock_merge.assert_not_called()
+
+    def test_different_resolutions(
+        self, mock_raster_open, mock_download, temp_dir, valid_bbox
+    ):
+        """Test downloading same area with different resolutions."""
+        for resolution in ["low", "medium", "high"]:
             result = download_tiles(
-                bbox=[170.0, -10.0, -170.0, 10.0],
-                save_directory=tmpdir,
-                resolution="low",
+                bbox=valid_bbox,
+                save_directory=temp_dir,
+                resolution=resolution,
             )
-
             assert result is not None
-
-    @patch("pygmrt.tiles._download_stream")
-    @patch("pygmrt.tiles.rasterio.open")
-    def test_different_resolutions(self, mock_raster_open, mock_download):
-        """Test downloading same area with different resolutions."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mock_dataset = MagicMock()
-            mock_raster_open.return_value = mock_dataset
-
-            bbox = [10.0, 20.0, 30.0, 40.0]
-
-            for resolution in ["low", "medium", "high"]:
-                result = download_tiles(
-                    bbox=bbox,
-                    save_directory=tmpdir,
-                    resolution=resolution,
-                )
-                assert result is not None
+        assert mock_download.call_count == 3